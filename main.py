@@ -7,28 +7,83 @@ scraping process. It also includes functionality for sending notifications about
 or completion status.
 """
 
+import base64
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import csv
+from functools import lru_cache
 import os
+import queue
 import re
-import signal
 import sys
 import threading
 import time
-from typing import Optional
-from bs4 import BeautifulSoup, ParserRejectedMarkup
+from types import MappingProxyType
+from typing import Iterable, Iterator, Optional, Union
 from dotenv import load_dotenv
-import pandas as pd
+from lxml.etree import HTMLPullParser, LxmlError, XPath, _Element
 import requests
 from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from requests_cache import CachedSession
 from urllib3.util.retry import Retry
 
 all_parsed_data = []
 load_dotenv()
 
-ntfy_url = os.getenv("NTFY_URL")
 
-COMPANY_NAME_SPECIAL_CASES = {
+def get_int_setting(name: str, default: Optional[int] = None) -> Optional[int]:
+    """
+    Read a whole-number setting from the environment.
+
+    Exits with a message instead of a traceback if the value is not a whole number.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (Optional[int]): Value to use if the variable is unset or empty.
+
+    Returns:
+        Optional[int]: The configured value, or the default.
+    """
+
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+
+    try:
+        return int(value)
+    except ValueError:
+        print(
+            f"Invalid value '{value}' for '{name}'. "
+            "Please set it to a whole number in the '.env' file."
+        )
+        sys.exit()
+
+
+ntfy_url = os.getenv("NTFY_URL")
+# Concurrent fetches, kept between 1 and 32 so the register is not flooded with requests
+max_workers = max(1, min(32, get_int_setting("MAX_WORKERS", 10)))
+http_cache_expire_after = get_int_setting("HTTP_CACHE_EXPIRE_AFTER")
+
+# Persistent session so repeated notifications reuse one connection to the ntfy server
+ntfy_session = requests.Session()
+ntfy_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+ntfy_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+
+# Notifications waiting to be sent by the background sender thread. An Event in the
+# queue is set by the sender once every notification queued before it is handled.
+ntfy_queue: queue.Queue[Union[tuple[str, Optional[dict[str, str]]], threading.Event]] = (
+    queue.Queue()
+)
+# The sender thread is started by the first queued notification
+ntfy_sender_lock = threading.Lock()
+ntfy_sender_started = threading.Event()
+
+# Seconds to wait for pending notifications before exiting
+NTFY_DRAIN_TIMEOUT = 30
+# Consecutive connection failures after which the remaining notifications are dropped
+NTFY_MAX_FAILURES = 3
+
+COMPANY_NAME_SPECIAL_CASES = MappingProxyType({
     "Abrdn Investments Middle East Limited": "aberdeen-asset-middle-east-limited",
     "Xanara ME LTD": "xanara-management-limited",
     "SS&C Financial Services Middle East Limited": "ssandc-financial-services-middle-east-limited",
@@ -41,12 +96,161 @@ COMPANY_NAME_SPECIAL_CASES = {
     "BNP Paribas S.A.": "bnp-paribas-sa",
     "Shorooq Partners Ltd": "shorooq-vc-partners-ltd",
     "UniCredit S.p.A.": "unicredit-spa",
-}
+})
+
+# Special cases keyed by the casefolded company name, so lookups ignore letter case
+CASEFOLDED_SPECIAL_CASES = MappingProxyType(
+    {name.casefold(): slug for name, slug in COMPANY_NAME_SPECIAL_CASES.items()}
+)
+
+# Character substitutions applied before the regex stage: '&' -> 'and', '.' -> '-'
+COMPANY_NAME_TRANSLATION = str.maketrans({"&": " and ", ".": "-"})
+NON_WORD_RE = re.compile(r"[^\w\s-]")
+SEPARATOR_RE = re.compile(r"[\s-]+")
+# One activity line, optionally followed by its effective and withdrawn date lines.
+# Expects one stripped, non-blank item per line, as produced by get_text_lines.
+ACTIVITY_RE = re.compile(
+    r"^(.+)\n(?:(\d{1,2} \w+ \d{4}.*)\n)?(?:(\d{1,2} \w+ \d{4}.*)\n)?", re.MULTILINE
+)
+
+# Accept-Encoding is left to requests, which only offers what urllib3 can decode
+# (including br and zstd when the brotli and zstandard packages are installed)
+REQUEST_HEADERS = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:130.0) Gecko/20100101 Firefox/130.0",
+    "Accept": ("text/html,application/xhtml+xml,application/xml;"
+               "q=0.9,image/avif,image/jxl,image/webp,image/png,image/svg+xml,*/*;q=0.8"),
+    "Connection": "keep-alive",
+})
+
+# Columns of the output CSV, which holds one row per regulated activity
+OUTPUT_COLUMNS = ["Company", "Conditions", "Regulated Activity", "Effective Date",
+                  "Withdrawn Date"]
+
+# Size of the response body chunks fed to the parser while the page is downloading
+PAGE_CHUNK_SIZE = 16 * 1024
+
+REGULATED_ACTIVITIES_CONTAINER_ID = "raTableContainer_fsfdetail"
+CONDITIONS_CONTAINER_CLASS = "fsp-first-table specialinfo-table"
+
+REGULATED_ACTIVITIES_XPATH = XPath(
+    './/div[contains(concat(" ", normalize-space(@class), " "), " opn-accord ")]'
+)
+CONDITIONS_XPATH = XPath(
+    './/div[contains(concat(" ", normalize-space(@class), " "), " container ")]'
+)
+
+
+def ntfy_sender() -> None:
+    """
+    Send the queued notifications to the ntfy service, one at a time.
+
+    Runs in a background thread so that scraping threads do not wait on ntfy. Once
+    the server could not be reached ``NTFY_MAX_FAILURES`` times in a row, it is treated
+    as down and the remaining notifications are dropped instead of each waiting for a
+    timeout. Errors caused by a single notification do not count towards that limit.
+
+    Returns:
+        None
+    """
+
+    failures = 0
+
+    while True:
+        item = ntfy_queue.get()
+
+        if isinstance(item, threading.Event):
+            item.set()
+            continue
+
+        message, headers = item
+
+        if failures >= NTFY_MAX_FAILURES:
+            continue
+
+        try:
+            ntfy_session.post(
+                ntfy_url,
+                data=message.encode("utf-8"),
+                headers=headers,
+                timeout=15
+            )
+            failures = 0
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            failures += 1
+            print(f"Error sending notification: {e}")
+
+            if failures == NTFY_MAX_FAILURES:
+                print("ntfy server unreachable, dropping the remaining notifications.")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # A bad notification must not stop the thread, or every later one is lost
+            print(f"Error sending notification: {e}")
+
+
+def start_ntfy_sender() -> None:
+    """
+    Start the background notification sender thread, unless it is already running.
+
+    Returns:
+        None
+    """
+
+    if ntfy_sender_started.is_set():
+        return
+
+    with ntfy_sender_lock:
+        if not ntfy_sender_started.is_set():
+            threading.Thread(target=ntfy_sender, daemon=True).start()
+            ntfy_sender_started.set()
+
+
+def wait_for_ntfy_notifications(timeout: float = NTFY_DRAIN_TIMEOUT) -> None:
+    """
+    Wait for the queued notifications to be sent, for at most ``timeout`` seconds.
+
+    Args:
+        timeout (float): Maximum number of seconds to wait.
+
+    Returns:
+        None
+    """
+
+    if not ntfy_sender_started.is_set():
+        return  # Nothing was ever queued
+
+    done = threading.Event()
+    ntfy_queue.put(done)
+
+    if not done.wait(timeout):
+        print(f"Gave up waiting for notifications after {timeout} seconds.")
+
+
+def encode_ntfy_headers(headers: Optional[dict[str, str]]) -> Optional[dict[str, str]]:
+    """
+    Encode non-ASCII header values so they can be sent to ntfy.
+
+    HTTP headers are sent as Latin-1, which cannot hold characters such as '’'. Such
+    values are sent as RFC 2047 encoded words instead, which ntfy decodes.
+
+    Args:
+        headers (Optional[Dict[str, str]]): Headers for the notification.
+
+    Returns:
+        Optional[Dict[str, str]]: The headers, with non-ASCII values encoded.
+    """
+
+    if headers is None:
+        return None
+
+    return {
+        name: value if value.isascii()
+        else f"=?UTF-8?B?{base64.b64encode(value.encode('utf-8')).decode('ascii')}?="
+        for name, value in headers.items()
+    }
 
 
 def send_ntfy_notification(message: str, headers: Optional[dict[str, str]]) -> None:
     """
-    Send a notification using the ntfy service.
+    Queue a notification to be sent using the ntfy service.
 
     Args:
         message (str): The message to be sent in the notification.
@@ -57,12 +261,8 @@ def send_ntfy_notification(message: str, headers: Optional[dict[str, str]]) -> N
     """
 
     if ntfy_url:
-        requests.post(
-            ntfy_url,
-            data=message,
-            headers=headers,
-            timeout=15
-        )
+        start_ntfy_sender()
+        ntfy_queue.put((message, encode_ntfy_headers(headers)))
     else:
         print(
             "NTFY_URL not configured in environment variables. Include a URL to get notifications."
@@ -70,6 +270,7 @@ def send_ntfy_notification(message: str, headers: Optional[dict[str, str]]) -> N
         )
 
 
+@lru_cache(maxsize=4096)
 def format_company_name(company_name: str) -> str:
     """
     Format a company name for use in URL construction.
@@ -82,22 +283,20 @@ def format_company_name(company_name: str) -> str:
     """
 
     # Handle special cases using the dictionary
-    if company_name in COMPANY_NAME_SPECIAL_CASES:
-        return COMPANY_NAME_SPECIAL_CASES[company_name]
+    special_case = CASEFOLDED_SPECIAL_CASES.get(company_name.casefold())
+    if special_case is not None:
+        return special_case
 
     # General case formatting
 
-    # Convert to lowercase
-    company_name = company_name.lower()
-
-    company_name = company_name.replace("&", " and ")  # Replace '&' with 'and'
-    company_name = company_name.replace(".", "-")      # Replace periods with hyphens
+    # Convert to lowercase, replace '&' with 'and' and periods with hyphens
+    company_name = company_name.lower().translate(COMPANY_NAME_TRANSLATION)
 
     # Replace non-alphanumeric characters (except spaces) with empty string
-    company_name = re.sub(r"[^\w\s-]", "", company_name)
+    company_name = NON_WORD_RE.sub("", company_name)
 
     # Replace multiple spaces or hyphens with a single hyphen
-    company_name = re.sub(r"[\s-]+", "-", company_name)
+    company_name = SEPARATOR_RE.sub("-", company_name)
 
     # Remove trailing hyphens
     company_name = company_name.rstrip("-")
@@ -107,119 +306,195 @@ def format_company_name(company_name: str) -> str:
 
 def create_session() -> requests.Session:
     """
-    Create a requests Session with retry configuration.
+    Create a requests Session with retry configuration and default request headers.
+
+    The connection pool is sized so that every worker thread can keep its own
+    keep-alive connection to the register instead of waiting on a shared one.
+    The session is shared by all workers, which only ever call ``get`` on it.
+
+    If ``HTTP_CACHE_EXPIRE_AFTER`` is set, successful responses are cached on disk for
+    that many seconds, so re-runs skip the network for pages fetched recently. Cache
+    headers sent by the server take precedence, and expired pages are revalidated
+    with a conditional request when the server provides validators.
 
     Returns:
         requests.Session: Configured session object.
     """
 
-    session = requests.Session()
+    if http_cache_expire_after is not None:
+        session = CachedSession("adgm_cache", backend="sqlite",
+                                expire_after=http_cache_expire_after, cache_control=True)
+    else:
+        session = requests.Session()
+
+    session.headers.update(REQUEST_HEADERS)
 
     retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retries)
+    # Every request goes to the same host, so a single pool with one connection per
+    # worker is enough to keep all of them alive for the whole run. Blocking on the pool
+    # means no throwaway connections are ever opened beyond it and then discarded.
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=1, pool_maxsize=max_workers,
+                          pool_block=True)
     session.mount("https://", adapter)
-    session.mount("https://", HTTPAdapter(max_retries=retries))
+    session.mount("http://", adapter)
 
     return session
 
 
-def is_date(string: str) -> bool:
+def get_text_lines(elements: Iterable[_Element]) -> list[str]:
     """
-    Check if a string looks like a date in a common format.
+    Split the text of each element into stripped lines, dropping blank ones.
 
     Args:
-        string (str): The string to check.
+        elements (Iterable[_Element]): Elements to read the text of, in order.
 
     Returns:
-        bool: True if the string matches a common date format, False otherwise.
+        List[str]: Non-blank lines of text, with surrounding whitespace removed.
     """
 
-    date_pattern = r"\d{1,2} \w+ \d{4}"
-    return re.match(date_pattern, string) is not None
+    lines = []
+
+    for element in elements:
+        for line in "".join(element.itertext()).split("\n"):
+            line = line.strip()
+            if line:
+                lines.append(line)
+
+    return lines
 
 
-def get_regulated_activities(soup: BeautifulSoup) -> list[dict[str, str]]:
+def get_regulated_activities(container: _Element) -> list[dict[str, str]]:
     """
-    Extract regulated activities from the BeautifulSoup object.
+    Extract regulated activities from the regulated activities container.
 
     Args:
-        soup (BeautifulSoup): Parsed HTML content.
+        container (_Element): Element with the id ``raTableContainer_fsfdetail``.
 
     Returns:
         List[Dict[str, str]]: List of dictionaries containing regulated activity information.
     """
 
-    regulated_activities = soup.find(id="raTableContainer_fsfdetail")
+    # Normalised so every line is a single stripped item, which ACTIVITY_RE relies on
+    text = "".join(f"{line}\n" for line in get_text_lines(REGULATED_ACTIVITIES_XPATH(container)))
 
-    ra_list = []
+    # Each match consumes an activity and up to two date lines following it
+    return [
+        {
+            "Regulated Activity": match[1],
+            "Effective Date": match[2],
+            "Withdrawn Date": match[3],
+        }
+        for match in ACTIVITY_RE.finditer(text)
+    ]
 
-    elements: BeautifulSoup = regulated_activities.find_all("div", class_="opn-accord")
-    for element in elements:
-        text = (
-            element.get_text().strip().split("\n")
-        )  # Strip and split based on new lines
 
-        # Filter out any empty or whitespace strings from the list
-        text = [item.strip() for item in text if item.strip()]
-        ra_list.extend(text)
+def get_conditions(container: _Element) -> str:
+    """
+    Extract conditions from the conditions table.
+
+    Args:
+        container (_Element): Element with the class ``fsp-first-table specialinfo-table``.
+
+    Returns:
+        str: Extracted conditions.
+    """
+
+    # The first non-blank line is the heading of the table
+    return get_text_lines(CONDITIONS_XPATH(container))[1]
+
 
-    # Remove every second empty string
-    result = []
-    i = 0
-    while i < len(ra_list):
-        activity = ra_list[i]
-        effective_date = None
-        withdrawn_date = None
+def iter_closed_elements(chunks: Iterable[bytes],
+                         encoding: Optional[str] = None) -> Iterator[tuple[str, _Element]]:
+    """
+    Feed HTML chunks to an incremental parser and yield elements as they are closed.
 
-        # Check if the next item is a date (effective date)
-        if i + 1 < len(ra_list) and is_date(ra_list[i + 1]):
-            effective_date = ra_list[i + 1]
-            i += 1  # Move to the next item (withdrawn date)
+    Args:
+        chunks (Iterable[bytes]): Chunks of the HTML document, in order.
+        encoding (Optional[str]): Character encoding of the document, if known. When
+            None, or not an encoding libxml2 supports, the parser uses the charset
+            declared in the document itself.
 
-        # Check if the next item is a withdrawn date
-        if i + 1 < len(ra_list) and is_date(ra_list[i + 1]):
-            withdrawn_date = ra_list[i + 1]
-            i += 1  # Move to the next item
+    Yields:
+        Tuple[str, _Element]: The parser event ("end") and the element it refers to.
+    """
 
-        # Create the dictionary and append it to the result
-        result.append({
-            "Regulated Activity": activity,
-            "Effective Date": effective_date,
-            "Withdrawn Date": withdrawn_date,
-        })
+    try:
+        parser = HTMLPullParser(events=("end",), encoding=encoding)
+    except LookupError:
+        # Servers sometimes send charsets that libxml2 does not know, such as utf8mb4
+        parser = HTMLPullParser(events=("end",))
 
-        i += 1  # Move to the next activity
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.read_events()
 
-    return result
+    parser.close()
+    yield from parser.read_events()
 
 
-def get_conditions(soup: BeautifulSoup) -> str:
+def parse_company_page(
+        chunks: Iterable[bytes], encoding: Optional[str] = None
+) -> tuple[list[dict[str, str]], Optional[str]]:
     """
-    Extract conditions from the BeautifulSoup object.
+    Parse a company page, stopping as soon as both data sections have been read.
+
+    The page is parsed while it is received and each section is extracted when its
+    closing tag is reached, so the remainder of the document is never parsed.
 
     Args:
-        soup (BeautifulSoup): Parsed HTML content.
+        chunks (Iterable[bytes]): Chunks of the raw HTML of the company page.
+        encoding (Optional[str]): Character encoding of the page, if known.
 
     Returns:
-        str: Extracted conditions.
+        Tuple[List[Dict[str, str]], Optional[str]]: The regulated activities and the
+        conditions, or an empty list / None for a section missing from the page.
     """
 
-    conditions = soup.find(class_="fsp-first-table specialinfo-table")
+    regulated_activities = None
+    conditions = None
 
-    conditions_list: list[str] = []
+    for _, element in iter_closed_elements(chunks, encoding):
+        if (regulated_activities is None
+                and element.get("id") == REGULATED_ACTIVITIES_CONTAINER_ID):
+            regulated_activities = get_regulated_activities(element)
+        elif conditions is None and element.get("class") == CONDITIONS_CONTAINER_CLASS:
+            conditions = get_conditions(element)
+        else:
+            continue
 
-    elements: BeautifulSoup = conditions.find_all("div", class_="container")
-    for element in elements:
-        text = element.get_text().split("\n")
-        conditions_list.extend(text)
+        element.clear()  # Free the extracted subtree
 
-    # Strip blank values
-    conditions_list = [item.strip() for item in conditions_list if item.strip()]
+        if regulated_activities is not None and conditions is not None:
+            break
 
-    return conditions_list[1]
+    return regulated_activities or [], conditions
 
 
-def fetch_company_data(session: requests.Session, company: str) -> dict[str, str]:
+def report_fetch_error(company: str, error: RequestException) -> None:
+    """
+    Report a failed company page download and send a notification.
+
+    Args:
+        company (str): Name of the company whose page could not be fetched.
+        error (RequestException): The exception raised while fetching the page.
+
+    Returns:
+        None
+    """
+
+    print(f"Error fetching data for {company}: {error}")
+
+    send_ntfy_notification(
+        f"Error fetching data for {company}: {error}",
+        headers={
+            "Title": f"Error fetching data for {company}",
+            "Priority": "urgent",
+            "Tags": "warning,adgm,fsra-register,error",
+        },
+    )
+
+
+def fetch_company_data(session: requests.Session, company: str) -> list[dict[str, str]]:
     """
     Fetch and parse company data from the ADGM website.
 
@@ -228,35 +503,32 @@ def fetch_company_data(session: requests.Session, company: str) -> dict[str, str
         company (str): Name of the company to fetch data for.
 
     Returns:
-        Dict[str, str]: Dictionary containing parsed company data.
+        List[Dict[str, str]]: One row per regulated activity of the company, or a single
+        row with only the company details if it has none or could not be fetched.
     """
 
     loop_start_time = time.time()
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:130.0) Gecko/20100101 Firefox/130.0",
-        "Accept": ("text/html,application/xhtml+xml,application/xml;"
-                   "q=0.9,image/avif,image/jxl,image/webp,image/png,image/svg+xml,*/*;q=0.8"),
-    }
-
-    url = (
-        f"https://www.adgm.com/public-registers/fsra/fsf/{format_company_name(company)}"
-    )
+    slug = format_company_name(company)
+    url = f"https://www.adgm.com/public-registers/fsra/fsf/{slug}"
 
     try:
-        response = session.get(url, headers=headers, timeout=10)
+        response = session.get(url, timeout=10, stream=True)
         if response.status_code == 404:
+            response.close()
+
             print(
                 f"There is a problem with the URL for {company}."
-                f"\n{format_company_name(company)} does not seem to"
+                f"\n{slug} does not seem to"
                 " be the correct URL for this company."
             )
 
             send_ntfy_notification(
-                message=f"Got {response.status_code} for {company}",
+                message=(f"Got {response.status_code} for {company}.\n"
+                         "Check if the link ending is correct by any chance."),
                 headers={
-                    "Title": (f"Incorrect link for {company}.\n\n"
-                              "Check if the link ending is correct by any chance."),
+                    # Header values cannot contain line breaks
+                    "Title": f"Incorrect link for {company}",
                     "Priority": "urgent",
                     "Tags": "warning,adgm, fsra-register,incorrect-link,404-Error",
                     "Actions": ("view, Go to FSRA Public Register, "
@@ -264,48 +536,62 @@ def fetch_company_data(session: requests.Session, company: str) -> dict[str, str
                 },
             )
 
-            return {"Company": company}
+            return [{"Company": company}]
 
         response.raise_for_status()  # Raises an HTTPError for bad responses
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching data for {company}: {e}")
-
-        send_ntfy_notification(
-            f"Error fetching data for {company}: {e}",
-            headers={
-                "Title": f"Error fetching data for {company}",
-                "Priority": "urgent",
-                "Tags": "warning,adgm,fsra-register,error",
-            },
-        )
+        # Release the streamed connection of an error response without reading its body
+        if e.response is not None:
+            e.response.close()
+
+        report_fetch_error(company, e)
+
+        return [{"Company": company}]
+
+    # Extract Regulated Activities and Conditions while the page is being received
+    with response:
+        # The parser only sees bytes, so hand it the charset from the Content-Type header.
+        # Without one, requests would report ISO-8859-1, which must not override a
+        # <meta charset> in the page itself.
+        declares_charset = "charset=" in response.headers.get("Content-Type", "").lower()
+        encoding = response.encoding if declares_charset else None
 
-        return {"Company": company}
+        chunks = response.iter_content(chunk_size=PAGE_CHUNK_SIZE)
 
-    soup = BeautifulSoup(response.content, "html.parser")
+        # The body is only read here, so a broken or timed out download surfaces now
+        try:
+            regulated_activities, conditions = parse_company_page(chunks, encoding)
+        except requests.exceptions.RequestException as e:
+            report_fetch_error(company, e)
+
+            return [{"Company": company}]
 
-    # Extract Regulated Activities
-    regulated_activities = get_regulated_activities(soup)
-    conditions = get_conditions(soup)
+        # Read the unparsed remainder so the connection can go back to the pool
+        try:
+            for _ in chunks:
+                pass
+        except requests.exceptions.RequestException as e:
+            # Both sections were already read, so only the connection is lost
+            print(f"Error reading the rest of the page for {company}: {e}")
 
-    company_data = {"Company": company, "Conditions": conditions}
+    company_details = {"Company": company, "Conditions": conditions}
 
-    # Append data to Dataframe
-    if regulated_activities:
-        for i, activity in enumerate(regulated_activities, start=1):
-            company_data[f"Regulated Activity {i}"] = activity["Regulated Activity"]
-            company_data[f"Effective Date {i}"] = activity["Effective Date"]
-            company_data[f"Withdrawn Date {i}"] = activity["Withdrawn Date"]
+    # One row per regulated activity, keeping the company details on each row
+    company_rows = [{**company_details, **activity} for activity in regulated_activities]
 
     print(
         f"Data extracted for {company} - Took {time.time() - loop_start_time:.2f} seconds"
     )
-    return company_data
+    return company_rows or [company_details]
 
 
 def main(companies: list[str], output_file: str) -> None:
     """
     Main function to orchestrate the web scraping process.
 
+    Rows are written to the partial output file as each company completes, and the
+    file is moved to ``output_file`` once every company has been processed.
+
     Args:
         companies (List[str]): List of company names to scrape data for.
         output_file (str): Name of the output CSV file.
@@ -315,46 +601,43 @@ def main(companies: list[str], output_file: str) -> None:
     """
 
     session = create_session()
-    df = pd.DataFrame()
-    executor = ThreadPoolExecutor(max_workers=10)
-    shutdown_event = threading.Event()
-
-    def signal_handler(*_):
-        print("\nCtrl+C pressed. Shutting down gracefully...")
-        shutdown_event.set()
-        executor.shutdown(wait=False, cancel_futures=True)
-
-    signal.signal(signal.SIGINT, signal_handler)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
 
     try:
         print("Starting data extraction...")
         start_time = time.time()
 
-        process_company_data(companies, session, executor, shutdown_event, df)
-
-        if shutdown_event.is_set():
-            save_results(df, output_file, start_time)
+        try:
+            with open(f"partial_{output_file}", "w", newline="", encoding="utf-8") as csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=OUTPUT_COLUMNS)
+                writer.writeheader()
+
+                process_company_data(companies, session, executor, writer)
+        except KeyboardInterrupt:
+            print("\nCtrl+C pressed. Shutting down gracefully...")
+            executor.shutdown(wait=False, cancel_futures=True)
+            save_partial_results(output_file)
         else:
-            save_partial_results(df, output_file)
+            save_results(output_file, start_time)
     except RequestException as e:
-        handle_extraction_error(df, output_file, f"Network error: {e}")
-    except ParserRejectedMarkup as e:
-        handle_extraction_error(df, output_file, f"HTML parsing error: {e}")
-    except pd.errors.EmptyDataError as e:
-        handle_extraction_error(df, output_file, f"DataFrame error: {e}")
+        handle_extraction_error(output_file, f"Network error: {e}")
+    except LxmlError as e:
+        handle_extraction_error(output_file, f"HTML parsing error: {e}")
+    except csv.Error as e:
+        handle_extraction_error(output_file, f"CSV error: {e}")
     except IOError as e:
-        handle_extraction_error(df, output_file, f"I/O error: {e}")
+        handle_extraction_error(output_file, f"I/O error: {e}")
     except Exception as e:
-        handle_extraction_error(df, output_file, f"Unexpected error: {e}")
+        handle_extraction_error(output_file, f"Unexpected error: {e}")
         raise
     finally:
         executor.shutdown(wait=True)
+        wait_for_ntfy_notifications()  # Deliver pending notifications before exiting
         print("All tasks have been completed or cancelled.")
 
 
 def process_company_data(companies: list[str], session: requests.Session,
-                         executor: ThreadPoolExecutor, shutdown_event: threading.Event,
-                         df: pd.DataFrame) -> None:
+                         executor: ThreadPoolExecutor, writer: csv.DictWriter) -> None:
     """
     Process company data using multi-threading.
 
@@ -362,24 +645,19 @@ def process_company_data(companies: list[str], session: requests.Session,
         companies (List[str]): List of company names to process.
         session (requests.Session): Session object for making HTTP requests.
         executor (ThreadPoolExecutor): Executor for multi-threading.
-        shutdown_event (threading.Event): Event to signal shutdown.
-        df (pd.DataFrame): DataFrame to store results.
+        writer (csv.DictWriter): CSV writer the extracted rows are written to as each
+            company completes.
 
     Returns:
         None
     """
 
     future_to_company = {executor.submit(fetch_company_data, session, company): company
-                         for company in companies if not shutdown_event.is_set()}
+                         for company in companies}
 
     for future in as_completed(future_to_company):
-        if shutdown_event.is_set():
-            break
-
         try:
-            company_data = future.result()
-            if company_data:
-                df = pd.concat([df, pd.DataFrame([company_data])], ignore_index=True)
+            writer.writerows(future.result())
         except requests.RequestException as exc:
             print(f"{future_to_company[future]} generated a request exception: {exc}")
         except ValueError as exc:
@@ -388,12 +666,11 @@ def process_company_data(companies: list[str], session: requests.Session,
             print(f"{future_to_company[future]} generated a key error: {exc}")
 
 
-def save_results(df: pd.DataFrame, output_file: str, start_time: float) -> None:
+def save_results(output_file: str, start_time: float) -> None:
     """
-    Save the results to a CSV file and send a notification.
+    Move the completed results into the output CSV file and send a notification.
 
     Args:
-        df (pd.DataFrame): DataFrame containing the results.
         output_file (str): Name of the output CSV file.
         start_time (float): Start time of the data extraction process.
 
@@ -401,7 +678,7 @@ def save_results(df: pd.DataFrame, output_file: str, start_time: float) -> None:
         None
     """
 
-    df.to_csv(output_file, index=False)
+    os.replace(f"partial_{output_file}", output_file)
 
     total_time = time.time() - start_time
     minutes, seconds = divmod(total_time, 60)
@@ -418,22 +695,20 @@ def save_results(df: pd.DataFrame, output_file: str, start_time: float) -> None:
     )
 
 
-def save_partial_results(df: pd.DataFrame, output_file: str) -> None:
+def save_partial_results(output_file: str) -> None:
     """
-    Save partial results to a CSV file and send a notification.
+    Report the partial results of an interrupted run and send a notification.
 
     Args:
-        df (pd.DataFrame): DataFrame containing the partial results.
         output_file (str): Name of the output CSV file.
 
     Returns:
         None
     """
 
-    print("Data extraction was interrupted. Saving partial results...")
+    print("Data extraction was interrupted.")
 
     partial_output_file = f"partial_{output_file}"
-    df.to_csv(partial_output_file, index=False)
 
     print(f"Partial results saved to {partial_output_file}")
 
@@ -447,12 +722,13 @@ def save_partial_results(df: pd.DataFrame, output_file: str) -> None:
     )
 
 
-def handle_extraction_error(df: pd.DataFrame, output_file: str, error: Exception) -> None:
+def handle_extraction_error(output_file: str, error: Exception) -> None:
     """
-    Handle errors during the extraction process, save partial results, and send a notification.
+    Handle errors during the extraction process and send a notification.
+
+    The rows extracted before the error are already in the partial output file.
 
     Args:
-        df (pd.DataFrame): DataFrame containing the partial results.
         output_file (str): Name of the output CSV file.
         error (Exception): The exception that occurred during extraction.
 
@@ -461,7 +737,6 @@ def handle_extraction_error(df: pd.DataFrame, output_file: str, error: Exception
     """
 
     partial_output_file = f"partial_{output_file}"
-    df.to_csv(partial_output_file, index=False)
 
     send_ntfy_notification(
         message=(f"App crashed\nPartial results saved to {partial_output_file}\n\n"
@@ -485,8 +760,8 @@ if __name__ == "__main__":
 
     try:
         with open(file_path, "r", encoding="utf-8") as file:
-            # List comprehension to read and strip each line
-            company_names = [line.strip() for line in file]
+            # Strip each line, skipping blank lines and repeated names (keeps file order)
+            company_names = list(dict.fromkeys(line.strip() for line in file if line.strip()))
     except FileNotFoundError:
         print(f"The file at {file_path} was not found.")
         sys.exit()